@@ -1,19 +1,30 @@
-import io
+import asyncio
+import copy
 import logging
 import os
 import tempfile
-import hashlib
-from functools import lru_cache
-from typing import List
-from PIL import Image
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from fastapi import FastAPI, File, UploadFile, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import cv2
 import numpy as np
 import torch
-from transformers import AutoProcessor, LlavaForConditionalGeneration
+import xxhash
+from transformers import (
+    AutoProcessor,
+    BatchFeature,
+    BitsAndBytesConfig,
+    LlavaForConditionalGeneration,
+    StaticCache,
+    TextIteratorStreamer,
+)
+from transformers.utils import is_flash_attn_2_available
 import uvicorn
 import uvloop
 
@@ -31,108 +42,410 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keep OpenCV on its SIMD paths but single-threaded; concurrency comes from request threads
+cv2.setUseOptimized(True)
+cv2.setNumThreads(1)
+
+# Number of video frames sent through a single generate() call
+VIDEO_BATCH_SIZE = 8
+
+# Set LLAVA_4BIT=1 to load 4-bit (NF4) weights with 16-bit compute; requires a CUDA GPU
+USE_4BIT = os.getenv("LLAVA_4BIT", "0") == "1"
+
 # Load LLaVA model and processor
 logger.info("Loading LLaVA model...")
 try:
     processor = AutoProcessor.from_pretrained("llava-hf/llava-1.5-13b-hf")
-    model = LlavaForConditionalGeneration.from_pretrained("llava-hf/llava-1.5-13b-hf", torch_dtype=torch.float16)
+    processor.tokenizer.padding_side = "left"  # Decoder-only batching needs prompts aligned to the right
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model.to(device)
+    is_ampere_or_newer = device.type == "cuda" and torch.cuda.get_device_capability(device)[0] >= 8
+    # FlashAttention-2 when flash-attn is installed (it only runs on Ampere and newer),
+    # otherwise PyTorch's fused SDPA kernels
+    if is_ampere_or_newer and is_flash_attn_2_available():
+        attn_implementation = "flash_attention_2"
+    else:
+        attn_implementation = "sdpa"
+    # FlashAttention-2 layers reject StaticCache, so they keep the dynamic cache
+    USE_STATIC_CACHE = device.type == "cuda" and attn_implementation != "flash_attention_2"
+    # BF16 on Ampere and newer (same tensor-core throughput, wider range); FP16 on older GPUs and CPU
+    dtype = torch.bfloat16 if is_ampere_or_newer else torch.float16
+    if USE_4BIT and device.type == "cuda":
+        quantization_config = BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=dtype,
+        )
+        model = LlavaForConditionalGeneration.from_pretrained(
+            "llava-hf/llava-1.5-13b-hf",
+            torch_dtype=dtype,
+            quantization_config=quantization_config,
+            device_map={"": device},
+            attn_implementation=attn_implementation,
+        )
+    else:
+        model = LlavaForConditionalGeneration.from_pretrained(
+            "llava-hf/llava-1.5-13b-hf",
+            torch_dtype=dtype,
+            attn_implementation=attn_implementation,
+        )
+        model.to(device)
     model.eval()
-    logger.info(f"LLaVA model loaded successfully on {device}")
+    if USE_STATIC_CACHE and not USE_4BIT:
+        # Compile the forward pass; generate() keeps calling it, so decode steps hit the fused graph.
+        # CUDA graphs need the fixed-shape StaticCache, so the FlashAttention-2 path stays eager.
+        torch._inductor.config.coordinate_descent_tuning = True
+        torch._inductor.config.fx_graph_cache = True
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False)
+    logger.info(f"LLaVA model loaded successfully on {device} ({dtype}, {attn_implementation} attention)")
 except Exception as e:
     logger.error(f"Failed to load LLaVA model: {str(e)}")
     raise Exception("Model loading failed")
 
-def preprocess_image(image: Image.Image) -> Image.Image:
+# Greedy decoding config built once; temperature is dropped since it is ignored without sampling
+generation_config = copy.deepcopy(model.generation_config)
+generation_config.update(
+    max_new_tokens=150,  # Reduced for shorter descriptions
+    do_sample=False,
+    num_beams=1,
+    use_cache=True,
+)
+
+# Improved prompt for more concise, relevant descriptions
+PROMPT = """
+Describe what you see in this image in a single, concise paragraph. 
+Focus on the most important objects, people, actions, and environment.
+Be specific and accurate rather than general. Limit to 2-3 sentences.
+"""
+
+# The chat template is constant, so render it once instead of per request
+TEMPLATED_PROMPT = processor.apply_chat_template(
+    [{"role": "user", "content": [{"type": "text", "text": PROMPT}, {"type": "image"}]}],
+    add_generation_prompt=True,
+)
+
+def preprocess_image(image: np.ndarray) -> np.ndarray:
     """Resize image to LLaVA's expected input size."""
-    image = image.resize((336, 336), Image.Resampling.LANCZOS)  # LLaVA uses 336x336
+    if image.shape[:2] == (336, 336):
+        return image
+    # INTER_AREA antialiases large downscales (and matches the GPU video path); LANCZOS4 for upscaling
+    shrinking = image.shape[0] > 336 or image.shape[1] > 336
+    interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4
+    image = cv2.resize(image, (336, 336), interpolation=interpolation)  # LLaVA uses 336x336
     return image
 
+def decode_image(image_data: bytes) -> np.ndarray:
+    """Decode JPEG/PNG bytes into a resized RGB array."""
+    image = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode image data")
+    # Resize before the color conversion so it only touches 336x336 pixels
+    image = preprocess_image(image)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
 # Image hash function for caching
-def hash_image(image_data: bytes) -> str:
-    return hashlib.md5(image_data).hexdigest()
+def hash_image(image_data: Union[bytes, memoryview]) -> str:
+    # xxh3 runs at memory bandwidth; the key only needs to be collision-resistant, not cryptographic
+    return xxhash.xxh3_128(image_data).hexdigest()
 
-# Cache recent image descriptions
-@lru_cache(maxsize=100)
-def get_cached_description(image_hash: str) -> str:
-    # This will be filled by the LRU cache
-    return None
+# Cache recent image descriptions (LRU, keyed by image hash)
+DESCRIPTION_CACHE_SIZE = 100
+description_cache: "OrderedDict[str, str]" = OrderedDict()
+description_cache_lock = threading.Lock()  # Requests run in worker threads
 
-def process_image_data(image_data: bytes) -> str:
-    """Process an image frame with LLaVA for a detailed description."""
-    try:
-        if not image_data:
-            raise ValueError("Image data is empty")
+def get_cached_description(image_hash: str) -> Optional[str]:
+    with description_cache_lock:
+        description = description_cache.get(image_hash)
+        if description is not None:
+            description_cache.move_to_end(image_hash)
+        return description
 
-        # Check cache based on image hash
-        image_hash = hash_image(image_data)
-        cached_result = get_cached_description(image_hash)
-        if cached_result:
-            logger.info("Using cached description")
-            return cached_result
+def cache_description(image_hash: str, description: str) -> None:
+    with description_cache_lock:
+        description_cache[image_hash] = description
+        description_cache.move_to_end(image_hash)
+        if len(description_cache) > DESCRIPTION_CACHE_SIZE:
+            description_cache.popitem(last=False)
+
+# Cheap fingerprints of recently seen payloads; only these pay for a full hash before the lookup
+RECENT_KEYS_SIZE = 1000
+recent_quick_keys: "OrderedDict[tuple, None]" = OrderedDict()
+
+def frame_buffer(frame: np.ndarray) -> memoryview:
+    """Zero-copy byte view of a decoded frame, for hashing; there is no encoded payload for video."""
+    return memoryview(np.ascontiguousarray(frame)).cast("B")
+
+def get_cache_key(image_data: Union[bytes, memoryview]) -> Optional[str]:
+    """Return the full image hash for the cache lookup, or None the first time a fingerprint is seen.
+
+    A payload with an unseen fingerprint cannot be cached yet, so the lookup is skipped;
+    callers hash it on cpu_pool while the GPU generates and still cache the result.
+    """
+    quick_key = (len(image_data), bytes(image_data[:64]), bytes(image_data[-64:]))
+    with description_cache_lock:
+        seen = quick_key in recent_quick_keys
+        recent_quick_keys[quick_key] = None
+        recent_quick_keys.move_to_end(quick_key)
+        if len(recent_quick_keys) > RECENT_KEYS_SIZE:
+            recent_quick_keys.popitem(last=False)
+    return hash_image(image_data) if seen else None
+
+# generate() only runs on the single gpu_pool thread, on this dedicated non-default stream;
+# inputs arrive already pinned from cpu_pool, so their H2D copies are asynchronous
+cuda_stream = torch.cuda.Stream(device=device) if device.type == "cuda" else None
+
+def pin_inputs(inputs: BatchFeature) -> BatchFeature:
+    """Cast and pin processor outputs on the host so the later device copy can be non-blocking."""
+    for key, value in inputs.items():
+        if torch.is_floating_point(value):
+            value = value.to(dtype)  # Cast on the host to halve the bytes copied
+        if device.type == "cuda":
+            # Pinned blocks are recycled by PyTorch's caching host allocator
+            value = value.pin_memory()
+        inputs[key] = value
+    return inputs
+
+def move_inputs_to_device(inputs: BatchFeature) -> BatchFeature:
+    """Copy pinned processor outputs to the model device."""
+    for key, value in inputs.items():
+        inputs[key] = value.to(device, non_blocking=True)
+    return inputs
+
+def prepare_inputs(images: List[np.ndarray]) -> BatchFeature:
+    """Resize RGB images (HxWx3 uint8) and build the batched, pinned model inputs on the host.
+
+    With the static cache, partial video batches are padded with copies of their last
+    image up to VIDEO_BATCH_SIZE; callers drop the extra output rows.
+    """
+    images = [preprocess_image(image) for image in images]
+    if USE_STATIC_CACHE and 1 < len(images) < VIDEO_BATCH_SIZE:
+        images += [images[-1]] * (VIDEO_BATCH_SIZE - len(images))
+    inputs = processor(
+        text=[TEMPLATED_PROMPT] * len(images), images=images, return_tensors="pt", padding=True
+    )
+    return pin_inputs(inputs)
 
-        logger.info(f"Processing image, size: {len(image_data)} bytes")
-        image = Image.open(io.BytesIO(image_data)).convert("RGB")
-        image = preprocess_image(image)
-
-        # Improved prompt for more concise, relevant descriptions
-        prompt = """
-        Describe what you see in this image in a single, concise paragraph. 
-        Focus on the most important objects, people, actions, and environment.
-        Be specific and accurate rather than general. Limit to 2-3 sentences.
-        """
-        
-        conversation = [{"role": "user", "content": [{"type": "text", "text": prompt}, {"type": "image"}]}]
-        inputs = processor.apply_chat_template(conversation, add_generation_prompt=True)
-        inputs = processor(text=inputs, images=image, return_tensors="pt").to(device, torch.float16)
-
-        # Generate description with optimized parameters
-        with torch.no_grad():
+# Prompt (576 image tokens + text) plus up to 150 new tokens must fit in the static KV cache
+STATIC_CACHE_LEN = 1024
+# Only batch sizes 1 and VIDEO_BATCH_SIZE are allocated (~0.8 GB per sequence slot for 13B);
+# prepare_inputs pads partial batches so no other size reaches generate()
+static_caches: Dict[int, StaticCache] = {}
+
+def get_static_cache(batch_size: int) -> StaticCache:
+    """Return the persistent KV cache for a batch size, allocating it on first use.
+
+    Fixed cache shapes let the compiled forward pass be reused across requests.
+    Only the single gpu_pool thread calls this, so caches are never shared concurrently.
+    Must be called inside the CUDA stream context that later uses the cache.
+    """
+    if batch_size not in (1, VIDEO_BATCH_SIZE):
+        raise ValueError(f"No static cache for batch size {batch_size}")
+    if batch_size not in static_caches:
+        static_caches[batch_size] = StaticCache(
+            config=model.config.get_text_config(),
+            max_batch_size=batch_size,
+            max_cache_len=STATIC_CACHE_LEN,
+            device=device,
+            dtype=dtype,
+        )
+    return static_caches[batch_size]
+
+def generate_ids(inputs: BatchFeature, streamer: Optional[TextIteratorStreamer] = None) -> torch.Tensor:
+    """Run generate() and return only the newly generated token ids, on the host."""
+    input_len = inputs["input_ids"].shape[1]
+
+    stream_context = torch.cuda.stream(cuda_stream) if cuda_stream is not None else nullcontext()
+    try:
+        with stream_context, torch.no_grad():
+            inputs = move_inputs_to_device(inputs)
+            past_key_values = None
+            if USE_STATIC_CACHE:
+                # Allocated, reset and written on the same stream
+                past_key_values = get_static_cache(inputs["input_ids"].shape[0])
+                past_key_values.reset()
             output_ids = model.generate(
                 **inputs,
-                max_new_tokens=150,  # Reduced for shorter descriptions
-                do_sample=False,
-                temperature=0.7
+                generation_config=generation_config,
+                past_key_values=past_key_values,
+                streamer=streamer,
             )
-        description = processor.decode(output_ids[0], skip_special_tokens=True)
-        description = description.replace(prompt, "").strip()
+            # Copy back on the same stream so the result is complete before decoding
+            return output_ids[:, input_len:].cpu()
+    except Exception:
+        if streamer is not None:
+            streamer.end()  # Unblock whoever is iterating the streamer
+        raise
+
+def decode_descriptions(output_ids: torch.Tensor) -> List[str]:
+    """Detokenize generated ids into one stripped description per row."""
+    # Decode only the newly generated tokens; the prompt prefix is never detokenized
+    descriptions = processor.batch_decode(output_ids, skip_special_tokens=True)
+    descriptions = [description.strip() for description in descriptions]
+    for description in descriptions:
         logger.info(f"Generated description: {description}")
-        
+    return descriptions
+
+# Requests are pipelined across two pools: decoding, resizing, hashing and tokenization run on
+# cpu_pool while the single gpu_pool thread runs generate() for whichever request is ready.
+# Torch kernels and OpenCV/PIL native code release the GIL, so the stages overlap.
+cpu_pool = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2), thread_name_prefix="cpu")
+gpu_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpu")
+
+async def run_in_pool(pool: ThreadPoolExecutor, func, *args):
+    """Run a blocking call on the given pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, func, *args)
+
+def prepare_image_request(image_data: bytes) -> Tuple[Optional[str], Optional[str], Optional[BatchFeature]]:
+    """Return (image_hash, cached_description, inputs); inputs is None on a cache hit."""
+    if not image_data:
+        raise ValueError("Image data is empty")
+
+    # Check cache based on image hash
+    image_hash = get_cache_key(image_data)
+    cached_result = get_cached_description(image_hash) if image_hash else None
+    if cached_result is not None:
+        logger.info("Using cached description")
+        return image_hash, cached_result, None
+
+    logger.info(f"Processing image, size: {len(image_data)} bytes")
+    return image_hash, None, prepare_inputs([decode_image(image_data)])
+
+async def process_image_data(image_data: bytes) -> str:
+    """Process an image frame with LLaVA for a detailed description."""
+    try:
+        image_hash, cached_result, inputs = await run_in_pool(cpu_pool, prepare_image_request, image_data)
+        if cached_result is not None:
+            return cached_result
+
+        generation = run_in_pool(gpu_pool, generate_ids, inputs)
+        if image_hash is None:
+            # The lookup skipped hashing; hash now, overlapped with generation, so this upload is cached
+            output_ids, image_hash = await asyncio.gather(generation, run_in_pool(cpu_pool, hash_image, image_data))
+        else:
+            output_ids = await generation
+        description = (await run_in_pool(cpu_pool, decode_descriptions, output_ids))[0]
+
         # Store in cache
-        get_cached_description.cache_parameters()[image_hash] = description
-        
+        cache_description(image_hash, description)
+
         return description
 
     except Exception as e:
         logger.error(f"Error processing image: {str(e)}")
         return f"Error: Failed to process image - {str(e)}"
 
-def extract_frames_from_video(video_data: bytes, frame_interval: int = 30) -> List[bytes]:
-    """Extract frames from a video for processing."""
+def hash_frames(frames: List[np.ndarray]) -> List[str]:
+    return [hash_image(frame_buffer(frame)) for frame in frames]
+
+def lookup_frames(frames: List[np.ndarray]) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """Return (image_hashes, cached_descriptions) for decoded RGB frames."""
+    image_hashes = [get_cache_key(frame_buffer(frame)) for frame in frames]
+    descriptions = [get_cached_description(image_hash) if image_hash else None for image_hash in image_hashes]
+    return image_hashes, descriptions
+
+async def process_image_batch(frames: List[np.ndarray]) -> List[str]:
+    """Process decoded RGB video frames (HxWx3 uint8) with LLaVA as one batch."""
+    try:
+        if not frames:
+            raise ValueError("No frames to process")
+
+        image_hashes, descriptions = await run_in_pool(cpu_pool, lookup_frames, frames)
+        uncached = [i for i, description in enumerate(descriptions) if description is None]
+        if len(uncached) < len(frames):
+            logger.info(f"Using cached descriptions for {len(frames) - len(uncached)} frames")
+        if not uncached:
+            return descriptions
+
+        logger.info(f"Processing batch of {len(uncached)} frames")
+        inputs = await run_in_pool(cpu_pool, prepare_inputs, [frames[i] for i in uncached])
+        # Frames whose lookup skipped hashing are hashed on cpu_pool while the GPU generates
+        unhashed = [i for i in uncached if image_hashes[i] is None]
+        output_ids, new_hashes = await asyncio.gather(
+            run_in_pool(gpu_pool, generate_ids, inputs),
+            run_in_pool(cpu_pool, hash_frames, [frames[i] for i in unhashed]),
+        )
+        for i, image_hash in zip(unhashed, new_hashes):
+            image_hashes[i] = image_hash
+
+        output_ids = output_ids[:len(uncached)]  # Drop rows added to pad the batch
+        generated = await run_in_pool(cpu_pool, decode_descriptions, output_ids)
+        for i, description in zip(uncached, generated):
+            descriptions[i] = description
+            cache_description(image_hashes[i], description)
+        return descriptions
+
+    except Exception as e:
+        logger.error(f"Error processing frames: {str(e)}")
+        return [f"Error: Failed to process frame - {str(e)}"] * len(frames)
+
+# NVDEC decoding needs an OpenCV build with CUDA and the cudacodec module (not the PyPI wheels)
+CUDA_VIDEO_DECODE = (
+    hasattr(cv2, "cudacodec") and hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+)
+
+def extract_frames_on_cpu(video_path: str, frame_interval: int) -> List[np.ndarray]:
+    """Decode with the CPU VideoCapture backend, resizing and converting only the kept frames."""
+    video = cv2.VideoCapture(video_path)
+    if not video.isOpened():
+        raise Exception("Failed to open video file")
+
+    frames = []
+    frame_count = 0
+    # grab() advances without the BGR conversion/copy; retrieve() only runs for kept frames
+    while video.grab():
+        if frame_count % frame_interval == 0:
+            ret, frame = video.retrieve()
+            if not ret:
+                break
+            logger.info(f"Extracting frame {frame_count}")
+            # Keep only 336x336 frames in memory; resizing first also shrinks the color conversion
+            frame = preprocess_image(frame)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        frame_count += 1
+
+    video.release()
+    return frames
+
+def extract_frames_on_gpu(video_path: str, frame_interval: int) -> List[np.ndarray]:
+    """Decode with NVDEC and resize/convert on the GPU, downloading only 336x336 RGB frames."""
+    reader = cv2.cudacodec.createVideoReader(video_path)
+
+    frames = []
+    frame_count = 0
+    while True:
+        if frame_count % frame_interval == 0:
+            ret, gpu_frame = reader.nextFrame()
+            if not ret:
+                break
+            logger.info(f"Extracting frame {frame_count}")
+            # cv2.cuda.resize has no Lanczos kernel; INTER_AREA is the best fit for downscaling
+            gpu_frame = cv2.cuda.resize(gpu_frame, (336, 336), interpolation=cv2.INTER_AREA)
+            gpu_frame = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGRA2RGB)  # NVDEC frames are BGRA
+            frames.append(gpu_frame.download())
+        elif not reader.grab():
+            break
+        frame_count += 1
+
+    return frames
+
+def extract_frames_from_video(video_data: bytes, frame_interval: int = 30) -> List[np.ndarray]:
+    """Extract RGB frames from a video for processing."""
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".mov") as temp_file:
             temp_file.write(video_data)
             temp_file_path = temp_file.name
 
-        video = cv2.VideoCapture(temp_file_path)
-        if not video.isOpened():
-            raise Exception("Failed to open video file")
-
         frames = []
-        frame_count = 0
-        while True:
-            ret, frame = video.read()
-            if not ret:
-                break
-            if frame_count % frame_interval == 0:
-                logger.info(f"Extracting frame {frame_count}")
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                _, buffer = cv2.imencode(".jpg", frame_rgb)
-                frames.append(buffer.tobytes())
-            frame_count += 1
-
-        video.release()
+        if CUDA_VIDEO_DECODE:
+            try:
+                frames = extract_frames_on_gpu(temp_file_path, frame_interval)
+                if not frames:
+                    logger.warning("GPU video decode returned no frames, falling back to CPU")
+            except cv2.error as e:
+                # NVDEC rejects some codecs/profiles (e.g. ProRes); the CPU backend can still decode them
+                logger.warning(f"GPU video decode failed, falling back to CPU: {str(e)}")
+        if not frames:
+            frames = extract_frames_on_cpu(temp_file_path, frame_interval)
         logger.info(f"Extracted {len(frames)} frames")
         return frames
 
@@ -147,6 +460,69 @@ def extract_frames_from_video(video_data: bytes, frame_interval: int = 30) -> Li
             except Exception as e:
                 logger.error(f"Failed to delete temp file: {str(e)}")
 
+def format_sse(text: str) -> str:
+    """Format text as a server-sent event, keeping embedded newlines inside the event."""
+    return "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
+# Readers block on TextIteratorStreamer queues for the whole gpu_pool wait plus generation,
+# so they get their own threads instead of starving the default executor used by /process-video
+stream_reader_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stream")
+
+def log_generation_error(generation: "asyncio.Future") -> None:
+    """Retrieve and log a streaming generation failure, even if the client already disconnected."""
+    if not generation.cancelled() and generation.exception() is not None:
+        logger.error(f"Streaming generation failed: {str(generation.exception())}")
+
+async def stream_image_description(image_data: bytes) -> AsyncIterator[str]:
+    """Yield the description of an image as server-sent events while it is generated."""
+    try:
+        image_hash, cached_result, inputs = await run_in_pool(cpu_pool, prepare_image_request, image_data)
+        if cached_result is not None:
+            yield format_sse(cached_result)
+            return
+
+        streamer = TextIteratorStreamer(processor.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        generation = asyncio.ensure_future(run_in_pool(gpu_pool, generate_ids, inputs, streamer))
+        generation.add_done_callback(log_generation_error)
+        if image_hash is None:
+            # The lookup skipped hashing; hash now, overlapped with generation, so this upload is cached
+            image_hash = await run_in_pool(cpu_pool, hash_image, image_data)
+        chunks = []
+        while True:
+            # The streamer blocks on a queue, so read it off the event loop (and off both pools)
+            text = await run_in_pool(stream_reader_pool, next, streamer, None)
+            if text is None:
+                break
+            if text:
+                chunks.append(text)
+                yield format_sse(text)
+        await generation
+
+        description = "".join(chunks).strip()
+        logger.info(f"Generated description: {description}")
+        cache_description(image_hash, description)
+
+    except Exception as e:
+        logger.error(f"Error streaming image: {str(e)}")
+        yield format_sse(f"Error: Failed to process image - {str(e)}")
+
+@app.on_event("startup")
+async def warm_up_model():
+    """Run dummy images through the model so compilation happens before serving traffic."""
+    if device.type != "cuda":
+        return
+    logger.info("Warming up LLaVA model...")
+    # Call the stages directly: process_image_data turns failures into "Error: ..." strings,
+    # which would let a broken generate() path start serving traffic
+    batch_sizes = [1, VIDEO_BATCH_SIZE] if USE_STATIC_CACHE else [1]
+    for batch_size in batch_sizes:
+        # With the static cache, video batches are padded to VIDEO_BATCH_SIZE, a second compiled shape;
+        # warm it here so the first /process-video does not recompile on the single gpu_pool thread
+        images = [np.zeros((336, 336, 3), dtype=np.uint8)] * batch_size
+        inputs = await run_in_pool(cpu_pool, prepare_inputs, images)
+        await run_in_pool(gpu_pool, generate_ids, inputs)
+    logger.info("Warm-up complete")
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to LiveFeedAI Server"}
@@ -164,13 +540,32 @@ async def process_image(file: UploadFile = File(...)):
         if file.content_type not in supported_formats:
             return JSONResponse(status_code=400, content={"error": f"Unsupported file type: {file.content_type}"})
 
-        description = process_image_data(image_data)
+        description = await process_image_data(image_data)
         return {"recognized_text": description}
 
     except Exception as e:
         logger.error(f"Error in process-image: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.post("/process-image/stream")
+async def process_image_stream(file: UploadFile = File(...)):
+    """Endpoint for live feed images that streams the description token by token."""
+    try:
+        logger.info(f"Received file: {file.filename}, type: {file.content_type}")
+        image_data = await file.read()
+        if not image_data:
+            return JSONResponse(status_code=400, content={"error": "Empty file received"})
+
+        supported_formats = ["image/jpeg", "image/png"]
+        if file.content_type not in supported_formats:
+            return JSONResponse(status_code=400, content={"error": f"Unsupported file type: {file.content_type}"})
+
+        return StreamingResponse(stream_image_description(image_data), media_type="text/event-stream")
+
+    except Exception as e:
+        logger.error(f"Error in process-image/stream: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 @app.post("/process-video")
 async def process_video(file: UploadFile = File(...)):
     """Endpoint for video processing (optional)."""
@@ -183,13 +578,19 @@ async def process_video(file: UploadFile = File(...)):
         if not is_video:
             return JSONResponse(status_code=400, content={"error": f"Invalid file type: {file.content_type}"})
 
-        frames = extract_frames_from_video(video_data)
+        frames = await asyncio.to_thread(extract_frames_from_video, video_data)
         if not frames:
             return JSONResponse(status_code=400, content={"error": "No frames extracted"})
 
+        # Batches are submitted together so the next batch is prepared while the GPU runs the current one
+        batch_descriptions = await asyncio.gather(*[
+            process_image_batch(frames[start:start + VIDEO_BATCH_SIZE])
+            for start in range(0, len(frames), VIDEO_BATCH_SIZE)
+        ])
+        frame_descriptions = [description for batch in batch_descriptions for description in batch]
+
         descriptions = []
-        for i, frame_data in enumerate(frames):
-            description = process_image_data(frame_data)
+        for i, description in enumerate(frame_descriptions):
             descriptions.append({
                 "frame": i,
                 "timestamp": i * 1.0,  # Simplified timestamp
@@ -219,7 +620,7 @@ if __name__ == "__main__":
         app=app,
         host="0.0.0.0",
         port=8000,
-        workers=2,  # Adjust based on your hardware
+        workers=1,  # Each worker process would load its own copy of the model into VRAM
         loop="uvloop",
         http="httptools",
         limit_concurrency=20,